@@ -8,12 +8,47 @@ from tkinter import ttk, messagebox, simpledialog
 from datetime import datetime, date
 import json
 import os
+import sys
+import atexit
+import queue
+import threading
+import time
+from bisect import bisect_left
 from enum import Enum
-from dataclasses import dataclass, asdict
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 import uuid
 from tkcalendar import DateEntry  # Import DateEntry from tkcalendar
 
+try:
+    import orjson  # Much faster encoder/decoder for the task file
+except ImportError:  # Fall back to the stdlib when orjson wheels are unavailable
+    orjson = None
+
+
+def dump_json(data, indent=True) -> bytes:
+    """Serialize data to JSON bytes, indented unless indent is False"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def load_json(raw: bytes):
+    """Parse JSON bytes produced by dump_json"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# The change log is folded back into the task file once it grows past
+# this size or the size of the last snapshot, whichever is larger
+LOG_COMPACT_MIN_BYTES = 64 * 1024
+
+# How long the writer thread waits for more changes before hitting the disk
+WRITE_COALESCE_SECONDS = 0.05
+
 
 # Data Models
 class Priority(Enum):
@@ -28,7 +63,16 @@ class Status(Enum):
     COMPLETED = "Completed"
 
 
-@dataclass
+# Enum values used on hot paths, computed once. Statuses and priorities read
+# from disk are interned too, so comparisons against these hit the identity
+# fast path.
+_COMPLETED = sys.intern(Status.COMPLETED.value)
+_PENDING = sys.intern(Status.PENDING.value)
+_PRIORITIES = tuple(sys.intern(p.value) for p in Priority)
+_STATUSES = tuple(sys.intern(s.value) for s in Status)
+
+
+@dataclass(slots=True)
 class Task:
     id: str
     title: str
@@ -39,82 +83,278 @@ class Task:
     created_date: str
     updated_date: str
     category: str = "General"
+    # (due_date, parsed date, date ordinal) cache, not persisted
+    _due: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self):
-        return asdict(self)
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'due_date': self.due_date,
+            'priority': self.priority,
+            'status': self.status,
+            'created_date': self.created_date,
+            'updated_date': self.updated_date,
+            'category': self.category,
+        }
 
     @classmethod
     def from_dict(cls, data):
-        return cls(**data)
-
-    def is_overdue(self):
-        if self.status == Status.COMPLETED.value:
+        task = cls(
+            data['id'],
+            data['title'],
+            data['description'],
+            data['due_date'],
+            sys.intern(data['priority']),
+            sys.intern(data['status']),
+            data['created_date'],
+            data['updated_date'],
+            data.get('category', "General"),
+        )
+        task._parse_due()  # Parse while loading rather than on every refresh
+        return task
+
+    def _parse_due(self):
+        cached = self._due
+        if cached is None or cached[0] != self.due_date:
+            try:
+                parsed = date.fromisoformat(self.due_date[:10])
+                ordinal = parsed.toordinal()
+            except (TypeError, ValueError):
+                parsed = ordinal = None
+            cached = self._due = (self.due_date, parsed, ordinal)
+        return cached
+
+    @property
+    def due(self) -> Optional[date]:
+        """Due date parsed once and cached on the instance (None if invalid)"""
+        return self._parse_due()[1]
+
+    @property
+    def due_ordinal(self) -> Optional[int]:
+        """Proleptic ordinal of the due date, for cheap day arithmetic"""
+        return self._parse_due()[2]
+
+    def is_overdue(self, today: Optional[date] = None):
+        if self.status == _COMPLETED:
             return False
-        try:
-            due = datetime.fromisoformat(self.due_date).date()
-            return due < date.today()
-        except:
+        due = self.due
+        if due is None:
             return False
+        return due < (today or date.today())
 
-    def days_until_due(self):
-        try:
-            due = datetime.fromisoformat(self.due_date).date()
-            today = date.today()
-            return (due - today).days
-        except:
+    def days_until_due(self, today: Optional[date] = None):
+        due = self.due
+        if due is None:
             return None
+        return (due - (today or date.today())).days
 
 
 class TaskManager:
     def __init__(self, data_file="tasks.json"):
         self.data_file = data_file
-        self.tasks: List[Task] = []
+        self.log_file = os.path.splitext(data_file)[0] + ".log"
+        self.tasks: Dict[str, Task] = {}  # Keyed by task id, in insertion order
+        # Open tasks sorted by due date, rebuilt lazily after changes
+        self._due_ordinals: List[int] = []
+        self._open_by_due: List[Task] = []
+        self._due_index_dirty = True
+        self._log_size = 0
+        self._snapshot_size = 0
+
+        # All disk writes happen on a single background writer thread so the
+        # Tk main loop never blocks on file I/O
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
         self.load_tasks()
 
     def add_task(self, task: Task):
-        self.tasks.append(task)
-        self.save_tasks()
+        self.tasks[task.id] = task
+        self._due_index_dirty = True
+        self._log_change({"op": "add", "task": task.to_dict()})
 
     def update_task(self, task_id: str, updated_task: Task):
-        for i, task in enumerate(self.tasks):
-            if task.id == task_id:
-                self.tasks[i] = updated_task
-                self.save_tasks()
-                return True
-        return False
+        if task_id not in self.tasks:
+            return False
+        self.tasks[task_id] = updated_task
+        self._due_index_dirty = True
+        self._log_change({"op": "upd", "id": task_id, "task": updated_task.to_dict()})
+        return True
 
     def delete_task(self, task_id: str):
-        self.tasks = [task for task in self.tasks if task.id != task_id]
-        self.save_tasks()
+        if self.tasks.pop(task_id, None) is not None:
+            self._due_index_dirty = True
+            self._log_change({"op": "del", "id": task_id})
 
     def get_task(self, task_id: str) -> Optional[Task]:
-        for task in self.tasks:
-            if task.id == task_id:
-                return task
-        return None
+        return self.tasks.get(task_id)
 
     def get_all_tasks(self) -> List[Task]:
-        return self.tasks
+        return list(self.tasks.values())
 
     def get_overdue_tasks(self) -> List[Task]:
-        return [task for task in self.tasks if task.is_overdue()]
+        """Open tasks due before today, earliest first"""
+        if self._due_index_dirty:
+            self._rebuild_due_index()
+        cutoff = bisect_left(self._due_ordinals, date.today().toordinal())
+        return self._open_by_due[:cutoff]
+
+    def _rebuild_due_index(self):
+        pairs = sorted(
+            ((task.due_ordinal, task) for task in self.tasks.values()
+             if task.status != _COMPLETED and task.due_ordinal is not None),
+            key=lambda pair: pair[0]
+        )
+        self._due_ordinals = [ordinal for ordinal, _ in pairs]
+        self._open_by_due = [task for _, task in pairs]
+        self._due_index_dirty = False
 
     def save_tasks(self):
-        try:
-            with open(self.data_file, 'w') as f:
-                json.dump([task.to_dict() for task in self.tasks], f, indent=2)
-        except Exception as e:
-            print(f"Error saving tasks: {e}")
+        """Schedule a full snapshot of the tasks, which also resets the change log"""
+        # Tasks are replaced rather than mutated, so a shallow copy is a
+        # consistent snapshot for the writer thread
+        self._queue.put(("snapshot", list(self.tasks.values())))
+        self._log_size = 0
+
+    def flush(self):
+        """Block until every scheduled write has reached the disk"""
+        self._queue.join()
+
+    def flush_to_disk(self):
+        """Wait for pending writes, then fsync the task files
+
+        Regular saves leave durability to the OS write cache; this is only
+        paid once, on shutdown.
+        """
+        self.flush()
+        for path in (self.data_file, self.log_file):
+            if os.path.exists(path):
+                try:
+                    with open(path, 'ab') as f:
+                        os.fsync(f.fileno())
+                except OSError as e:
+                    print(f"Error syncing {path}: {e}")
+
+    def close(self):
+        """Flush pending writes to disk and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+            self.flush_to_disk()
 
     def load_tasks(self):
+        self._due_index_dirty = True
         if os.path.exists(self.data_file):
             try:
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
-                self.tasks = [Task.from_dict(task_data) for task_data in data]
+                with open(self.data_file, 'rb') as f:
+                    raw = f.read()
+                tasks = (Task.from_dict(task_data) for task_data in load_json(raw))
+                self.tasks = {task.id: task for task in tasks}
+                self._snapshot_size = len(raw)
             except Exception as e:
                 print(f"Error loading tasks: {e}")
-                self.tasks = []
+                self.tasks = {}
+        self._replay_log()
+
+    def _log_change(self, entry):
+        """Queue a single change record instead of rewriting the task file"""
+        line = dump_json(entry, indent=False) + b"\n"
+        self._queue.put(("log", line))
+        self._log_size += len(line)
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self._log_size > max(LOG_COMPACT_MIN_BYTES, self._snapshot_size):
+            self.save_tasks()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            time.sleep(WRITE_COALESCE_SECONDS)  # Let bursts of edits pile up
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            self._write_batch([item for item in batch if item is not None])
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, batch):
+        # Only the newest snapshot matters; log records queued before it are
+        # already part of it
+        lines = []
+        for kind, payload in batch:
+            if kind == "snapshot":
+                self._write_snapshot(payload)
+                lines = []
+            else:
+                lines.append(payload)
+        if lines:
+            try:
+                with open(self.log_file, 'ab') as f:
+                    f.write(b"".join(lines))
+            except Exception as e:
+                print(f"Error logging task changes: {e}")
+
+    def _write_snapshot(self, tasks):
+        try:
+            data = dump_json([task.to_dict() for task in tasks])
+
+            # Write a temp file and swap it in, so a crash mid-write never
+            # leaves a truncated tasks.json behind
+            tmp_file = self.data_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, self.data_file)
+            self._snapshot_size = len(data)
+
+            # Everything in the log is now part of the snapshot
+            if os.path.exists(self.log_file):
+                os.remove(self.log_file)
+        except Exception as e:
+            print(f"Error saving tasks: {e}")
+
+    def _replay_log(self):
+        """Apply changes logged since the last snapshot"""
+        if not os.path.exists(self.log_file):
+            return
+        torn = False
+        try:
+            with open(self.log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = load_json(line)
+                    except ValueError:
+                        torn = True  # Partial write from an interrupted session
+                        break
+                    self._apply_change(entry)
+            self._log_size = os.path.getsize(self.log_file)
+        except Exception as e:
+            print(f"Error replaying task log: {e}")
+            return
+
+        # Don't append new changes after a damaged record
+        if torn:
+            self.save_tasks()
+
+    def _apply_change(self, entry):
+        if entry["op"] == "del":
+            self.tasks.pop(entry["id"], None)
+            return
+
+        # Adds are applied as upserts so a log that outlived its snapshot
+        # (e.g. a crash mid-compaction) replays without duplicates
+        task = Task.from_dict(entry["task"])
+        self.tasks[task.id] = task
 
 
 class TaskDialog:
@@ -161,14 +401,14 @@ class TaskDialog:
         ttk.Label(self.dialog, text="Priority:").grid(row=3, column=0, sticky="w", padx=10, pady=5)
         self.priority_var = tk.StringVar(value=Priority.MEDIUM.value)
         priority_combo = ttk.Combobox(self.dialog, textvariable=self.priority_var,
-                                      values=[p.value for p in Priority], state="readonly")
+                                      values=_PRIORITIES, state="readonly")
         priority_combo.grid(row=3, column=1, padx=10, pady=5, sticky="w")
 
         # Status
         ttk.Label(self.dialog, text="Status:").grid(row=4, column=0, sticky="w", padx=10, pady=5)
-        self.status_var = tk.StringVar(value=Status.PENDING.value)
+        self.status_var = tk.StringVar(value=_PENDING)
         status_combo = ttk.Combobox(self.dialog, textvariable=self.status_var,
-                                    values=[s.value for s in Status], state="readonly")
+                                    values=_STATUSES, state="readonly")
         status_combo.grid(row=4, column=1, padx=10, pady=5, sticky="w")
 
         # Category
@@ -300,6 +540,11 @@ class TaskManagerApp:
         self.tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
+        # Row colors
+        self.tree.tag_configure("completed", background="lightgreen")
+        self.tree.tag_configure("overdue", background="lightcoral")
+        self.tree.tag_configure("due_soon", background="lightyellow")
+
         # Status Bar
         self.status_bar = ttk.Label(self.root, text="Ready", relief="sunken")
         self.status_bar.pack(side="bottom", fill="x")
@@ -322,15 +567,8 @@ class TaskManagerApp:
             messagebox.showwarning("Warning", "Please select a task to edit")
             return
 
-        item = self.tree.item(selected[0])
-        task_id = item['values'][0] if item['values'] else None
-
-        # Find task by title (since we don't show ID in the tree)
-        task = None
-        for t in self.task_manager.get_all_tasks():
-            if t.title == item['values'][0]:
-                task = t
-                break
+        # Rows are keyed by task id
+        task = self.task_manager.get_task(selected[0])
 
         if not task:
             messagebox.showerror("Error", "Task not found")
@@ -351,14 +589,7 @@ class TaskManagerApp:
             return
 
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this task?"):
-            item = self.tree.item(selected[0])
-
-            # Find and delete task
-            for task in self.task_manager.get_all_tasks():
-                if task.title == item['values'][0]:
-                    self.task_manager.delete_task(task.id)
-                    break
-
+            self.task_manager.delete_task(selected[0])
             self.refresh_task_list()
             self.status_bar.config(text="Task deleted successfully")
 
@@ -368,47 +599,56 @@ class TaskManagerApp:
             messagebox.showwarning("Warning", "Please select a task to mark as complete")
             return
 
-        item = self.tree.item(selected[0])
-
         # Find and update task
-        for task in self.task_manager.get_all_tasks():
-            if task.title == item['values'][0]:
-                updated_task = Task(
-                    id=task.id,
-                    title=task.title,
-                    description=task.description,
-                    due_date=task.due_date,
-                    priority=task.priority,
-                    status=Status.COMPLETED.value,
-                    created_date=task.created_date,
-                    updated_date=datetime.now().isoformat(),
-                    category=task.category
-                )
-                self.task_manager.update_task(task.id, updated_task)
-                break
+        task = self.task_manager.get_task(selected[0])
+        if task:
+            updated_task = Task(
+                id=task.id,
+                title=task.title,
+                description=task.description,
+                due_date=task.due_date,
+                priority=task.priority,
+                status=_COMPLETED,
+                created_date=task.created_date,
+                updated_date=datetime.now().isoformat(),
+                category=task.category
+            )
+            self.task_manager.update_task(task.id, updated_task)
 
         self.refresh_task_list()
         self.status_bar.config(text="Task marked as complete")
 
     def refresh_task_list(self):
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        # Add tasks to tree
-        for task in self.task_manager.get_all_tasks():
+        # Clear existing items in a single Tcl call
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+
+        # Build rows and status counters in one pass over the tasks
+        today_ord = date.today().toordinal()
+        tasks = self.task_manager.get_all_tasks()
+        completed_tasks = 0
+        overdue_tasks = 0
+        insert = self.tree.insert
+        for task in tasks:
             due_date_str = task.due_date.split('T')[0]  # Just the date part
 
             # Color code based on status and due date
-            tags = []
-            if task.status == Status.COMPLETED.value:
-                tags.append("completed")
-            elif task.is_overdue():
-                tags.append("overdue")
-            elif task.days_until_due() is not None and task.days_until_due() <= 1:
-                tags.append("due_soon")
-
-            self.tree.insert("", "end", values=(
+            due_ord = task.due_ordinal
+            if task.status == _COMPLETED:
+                tags = ("completed",)
+                completed_tasks += 1
+            elif due_ord is None:
+                tags = ()
+            elif due_ord < today_ord:
+                tags = ("overdue",)
+                overdue_tasks += 1
+            elif due_ord - today_ord <= 1:
+                tags = ("due_soon",)
+            else:
+                tags = ()
+
+            insert("", "end", iid=task.id, values=(
                 task.title,
                 due_date_str,
                 task.priority,
@@ -416,17 +656,8 @@ class TaskManagerApp:
                 task.category
             ), tags=tags)
 
-        # Configure tags
-        self.tree.tag_configure("completed", background="lightgreen")
-        self.tree.tag_configure("overdue", background="lightcoral")
-        self.tree.tag_configure("due_soon", background="lightyellow")
-
         # Update status bar
-        total_tasks = len(self.task_manager.get_all_tasks())
-        overdue_tasks = len(self.task_manager.get_overdue_tasks())
-        completed_tasks = len([t for t in self.task_manager.get_all_tasks() if t.status == Status.COMPLETED.value])
-
-        self.status_bar.config(text=f"Total: {total_tasks} | Completed: {completed_tasks} | Overdue: {overdue_tasks}")
+        self.status_bar.config(text=f"Total: {len(tasks)} | Completed: {completed_tasks} | Overdue: {overdue_tasks}")
 
     def check_overdue_tasks(self):
         overdue_tasks = self.task_manager.get_overdue_tasks()
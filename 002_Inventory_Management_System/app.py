@@ -1,17 +1,33 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import Flask, render_template, request, redirect, url_for, flash, session, g
 from werkzeug.security import generate_password_hash, check_password_hash
 import sqlite3
-from functools import wraps
+from functools import wraps, lru_cache
 from datetime import datetime
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key_here'  # Change this in production
 
+DATABASE = 'inventory.db'
+TRANSACTIONS_PAGE_SIZE = 50
+
+# Password hashing: scrypt is memory-hard, so it stays expensive for attackers
+# while costing less CPU per login than werkzeug's older high-iteration
+# pbkdf2 default. Existing pbkdf2 hashes still verify.
+PASSWORD_HASH_METHOD = 'scrypt'
+
+# Checked against when the username doesn't exist so failed logins take the
+# same time either way and don't reveal which usernames are registered
+DUMMY_HASH = generate_password_hash('not-a-real-password', method=PASSWORD_HASH_METHOD)
+
 # Database initialization
 def init_db():
-    conn = sqlite3.connect('inventory.db')
+    conn = sqlite3.connect(DATABASE)
     c = conn.cursor()
     
+    # WAL lets readers keep going while a request is writing; the setting
+    # is stored in the database file so it only needs to be set once
+    c.execute('PRAGMA journal_mode=WAL')
+    
     # Create users table
     c.execute('''CREATE TABLE IF NOT EXISTS users (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -48,14 +64,36 @@ def init_db():
         FOREIGN KEY (item_id) REFERENCES items (id)
     )''')
     
+    # Indexes for the hot lookups: recent transactions, the transactions/items
+    # join, the items list ordered by name and the low stock checks
+    c.execute('CREATE INDEX IF NOT EXISTS idx_tx_created ON transactions(created_at DESC)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_tx_item ON transactions(item_id)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_items_name ON items(name)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_items_lowstock ON items(quantity, minimum_stock)')
+    
+    # Refresh planner statistics so the indexes above get used
+    c.execute('ANALYZE')
+    
     conn.commit()
     conn.close()
 
-# Database helper function
+# Database helper functions
 def get_db():
-    conn = sqlite3.connect('inventory.db')
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Return the connection for the current request, opening it on first use"""
+    db = getattr(g, '_db', None)
+    if db is None:
+        db = g._db = sqlite3.connect(DATABASE)
+        db.row_factory = sqlite3.Row
+        db.execute('PRAGMA synchronous=NORMAL')  # Safe with WAL, far fewer fsyncs
+        db.execute('PRAGMA temp_store=MEMORY')
+        db.execute('PRAGMA cache_size=-20000')  # ~20MB page cache
+    return db
+
+@app.teardown_appcontext
+def close_db(exception):
+    db = g.pop('_db', None)
+    if db is not None:
+        db.close()
 
 # Login decorator
 def login_required(f):
@@ -95,15 +133,13 @@ def register():
             try:
                 db.execute(
                     'INSERT INTO users (username, password, email) VALUES (?, ?, ?)',
-                    (username, generate_password_hash(password), email)
+                    (username, generate_password_hash(password, method=PASSWORD_HASH_METHOD), email)
                 )
                 db.commit()
                 flash('Registration successful! Please login.')
                 return redirect(url_for('login'))
             except db.IntegrityError:
                 error = f"User {username} or email {email} is already registered."
-            finally:
-                db.close()
                 
         flash(error)
     
@@ -117,12 +153,13 @@ def login():
         
         db = get_db()
         error = None
+        # username is UNIQUE, so this is a lookup on its automatic index
         user = db.execute(
-            'SELECT * FROM users WHERE username = ?', (username,)
+            'SELECT id, username, password FROM users WHERE username = ?', (username,)
         ).fetchone()
-        db.close()
         
         if user is None:
+            check_password_hash(DUMMY_HASH, password)
             error = 'Incorrect username.'
         elif not check_password_hash(user['password'], password):
             error = 'Incorrect password.'
@@ -147,15 +184,18 @@ def logout():
 def dashboard():
     db = get_db()
     
-    # Get summary statistics
-    stats = {}
-    stats['total_items'] = db.execute('SELECT COUNT(*) FROM items').fetchone()[0]
-    stats['total_value'] = db.execute(
-        'SELECT SUM(quantity * unit_price) FROM items'
-    ).fetchone()[0] or 0
-    stats['low_stock'] = db.execute(
-        'SELECT COUNT(*) FROM items WHERE quantity <= minimum_stock'
-    ).fetchone()[0]
+    # Get summary statistics in a single pass over items
+    row = db.execute('''
+        SELECT COUNT(*) AS total_items,
+               COALESCE(SUM(quantity * unit_price), 0) AS total_value,
+               COALESCE(SUM(CASE WHEN quantity <= minimum_stock THEN 1 ELSE 0 END), 0) AS low_stock
+        FROM items
+    ''').fetchone()
+    stats = {
+        'total_items': row['total_items'],
+        'total_value': row['total_value'],
+        'low_stock': row['low_stock']
+    }
     
     # Get recent transactions
     recent_transactions = db.execute('''
@@ -172,7 +212,6 @@ def dashboard():
         ORDER BY quantity ASC LIMIT 5
     ''').fetchall()
     
-    db.close()
     return render_template('dashboard.html', 
                          stats=stats,
                          recent_transactions=recent_transactions,
@@ -182,8 +221,11 @@ def dashboard():
 @login_required
 def items_list():
     db = get_db()
-    items = db.execute('SELECT * FROM items ORDER BY name').fetchall()
-    db.close()
+    # Hand the cursor to the template so rows are streamed, not built into a list
+    items = db.execute('''
+        SELECT id, name, quantity, unit_price, category, minimum_stock
+        FROM items ORDER BY name
+    ''')
     return render_template('items/list.html', items=items)
 
 @app.route('/items/add', methods=['GET', 'POST'])
@@ -198,21 +240,20 @@ def add_item():
         minimum_stock = int(request.form['minimum_stock'])
         
         db = get_db()
-        db.execute('''
+        item_id = db.execute('''
             INSERT INTO items (name, description, quantity, unit_price, category, minimum_stock)
             VALUES (?, ?, ?, ?, ?, ?)
-        ''', (name, description, quantity, unit_price, category, minimum_stock))
+            RETURNING id
+        ''', (name, description, quantity, unit_price, category, minimum_stock)).fetchone()[0]
         
         # Record initial stock as transaction if quantity > 0
         if quantity > 0:
-            item_id = db.execute('SELECT last_insert_rowid()').fetchone()[0]
             db.execute('''
                 INSERT INTO transactions (item_id, type, quantity, unit_price, total_amount, notes)
                 VALUES (?, 'in', ?, ?, ?, ?)
             ''', (item_id, quantity, unit_price, quantity * unit_price, 'Initial stock'))
         
         db.commit()
-        db.close()
         flash('Item added successfully!')
         return redirect(url_for('items_list'))
     
@@ -236,26 +277,41 @@ def edit_item(id):
             WHERE id=?
         ''', (name, description, category, minimum_stock, id))
         db.commit()
-        db.close()
         
         flash('Item updated successfully!')
         return redirect(url_for('items_list'))
     
-    db.close()
     return render_template('items/edit.html', item=item)
 
 @app.route('/transactions')
 @login_required
 def transactions_list():
+    # Keyset pagination: each page starts after the (created_at, id) of the
+    # last row shown, so the query is an index seek instead of an OFFSET scan
+    before = request.args.get('before')
+    before_id = request.args.get('before_id', type=int)
+    limit = min(max(request.args.get('limit', TRANSACTIONS_PAGE_SIZE, type=int), 1), 200)
+    
     db = get_db()
-    transactions = db.execute('''
+    query = '''
         SELECT t.*, i.name as item_name
         FROM transactions t
         JOIN items i ON t.item_id = i.id
-        ORDER BY t.created_at DESC
-    ''').fetchall()
-    db.close()
-    return render_template('transactions/list.html', transactions=transactions)
+    '''
+    params = []
+    if before is not None and before_id is not None:
+        query += ' WHERE (t.created_at, t.id) < (?, ?)'
+        params.extend([before, before_id])
+    query += ' ORDER BY t.created_at DESC, t.id DESC LIMIT ?'
+    params.append(limit + 1)  # One extra row tells us whether there is a next page
+    
+    transactions = db.execute(query, params).fetchall()
+    next_page = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        last = transactions[-1]
+        next_page = {'before': last['created_at'], 'before_id': last['id'], 'limit': limit}
+    return render_template('transactions/list.html', transactions=transactions, next_page=next_page)
 
 @app.route('/transactions/add', methods=['GET', 'POST'])
 @login_required
@@ -269,16 +325,23 @@ def add_transaction():
         notes = request.form['notes']
         
         db = get_db()
-        item = db.execute('SELECT quantity FROM items WHERE id = ?', (item_id,)).fetchone()
         
-        if trans_type == 'out' and quantity > item['quantity']:
+        # Take the write lock up front so the stock check, the update and the
+        # transaction record commit together with a single fsync
+        db.execute('BEGIN IMMEDIATE')
+        
+        # Update item quantity, checking stock in the same statement so
+        # concurrent requests can't oversell
+        delta = quantity if trans_type == 'in' else -quantity
+        cur = db.execute(
+            'UPDATE items SET quantity = quantity + ? WHERE id = ? AND quantity + ? >= 0',
+            (delta, item_id, delta)
+        )
+        if cur.rowcount == 0:
+            db.rollback()
             flash('Error: Insufficient stock!')
             return redirect(url_for('add_transaction'))
         
-        # Update item quantity
-        new_quantity = item['quantity'] + quantity if trans_type == 'in' else item['quantity'] - quantity
-        db.execute('UPDATE items SET quantity = ? WHERE id = ?', (new_quantity, item_id))
-        
         # Add transaction record
         total_amount = quantity * unit_price
         db.execute('''
@@ -287,13 +350,11 @@ def add_transaction():
         ''', (item_id, trans_type, quantity, unit_price, total_amount, reference_no, notes))
         
         db.commit()
-        db.close()
         flash('Transaction added successfully!')
         return redirect(url_for('transactions_list'))
     
     db = get_db()
     items = db.execute('SELECT id, name, quantity FROM items').fetchall()
-    db.close()
     return render_template('transactions/add.html', items=items)
 
 # Template filters
@@ -301,11 +362,19 @@ def add_transaction():
 def currency_filter(value):
     return f"${value:,.2f}"
 
+@lru_cache(maxsize=4096)
+def format_timestamp(value):
+    """Format a SQLite timestamp string; rows created together share values"""
+    try:
+        return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M')
+    except ValueError:
+        return value
+
 @app.template_filter('datetime')
 def datetime_filter(value):
-    if isinstance(value, str):
-        value = datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
-    return value.strftime('%Y-%m-%d %H:%M')
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M')
+    return format_timestamp(value)
 
 if __name__ == '__main__':
     init_db()
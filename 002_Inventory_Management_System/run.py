@@ -3,16 +3,18 @@
 import os
 import sys
 import subprocess
+from importlib.metadata import distribution, PackageNotFoundError
 
 def check_dependencies():
     """Check if required packages are installed"""
     required_packages = ['flask', 'werkzeug', 'reportlab']
     missing_packages = []
     
+    # Look up installed package metadata instead of importing each package
     for package in required_packages:
         try:
-            __import__(package)
-        except ImportError:
+            distribution(package)
+        except PackageNotFoundError:
             missing_packages.append(package)
     
     return missing_packages
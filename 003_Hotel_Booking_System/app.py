@@ -1,15 +1,163 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session
+from flask import (Flask, render_template, stream_template, request, redirect, url_for, flash,
+                   get_flashed_messages, session, g, has_app_context)
+from flask.sessions import SecureCookieSessionInterface
 from werkzeug.security import generate_password_hash, check_password_hash
 import sqlite3
-from datetime import datetime
-from functools import wraps
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from contextlib import contextmanager
+from itertools import chain
+from datetime import date
+from functools import lru_cache, wraps
+
+try:
+    # Native argon2 releases the GIL while hashing, so logins don't stall other requests
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:  # Fall back to werkzeug's hashing when argon2-cffi is unavailable
+    PasswordHasher = None
+
+class StaticBypassSessionInterface(SecureCookieSessionInterface):
+    """Skip decoding the session cookie for static file requests"""
+    
+    def open_session(self, app, request):
+        if request.path.startswith(app.static_url_path + '/'):
+            return self.make_null_session(app)
+        return super().open_session(app, request)
 
 app = Flask(__name__)
 app.secret_key = 'your_secret_key_here'  # Change this in production
+app.session_interface = StaticBypassSessionInterface()
+
+DATABASE = 'hotel.db'
+POOL_SIZE = 8  # Match gunicorn's threads per worker (gunicorn.conf.py)
+FETCH_SIZE = 64  # Rows pulled per round trip when streaming a page
+
+# Idle connections kept open between requests (most recently used first)
+_POOL = queue.LifoQueue(maxsize=POOL_SIZE)
+
+# Writes are funnelled through one long-lived connection owned by a single
+# writer thread, so requests never contend for SQLite's write lock
+_WRITE_QUEUE = queue.Queue()
+_writer_lock = threading.Lock()
+_writer_thread = None
+
+WriteResult = namedtuple('WriteResult', 'rowcount lastrowid rows')
+
+# Applied to every connection. WAL lets readers run alongside a writer and,
+# with synchronous=NORMAL, commits skip the per-transaction fsync. While the
+# app runs, hotel.db-wal and hotel.db-shm files sit next to hotel.db.
+CONNECTION_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',  # 256MB
+    'PRAGMA cache_size=-20000',  # ~20MB page cache
+)
+
+# Room details by id. Rooms only change through init_db, so pages can attach
+# room info from here instead of joining the rooms table.
+ROOMS_BY_ID: dict[int, dict] = {}
+
+# Per-room booked-days map over the next LOOKAHEAD_DAYS days, one byte per
+# day starting at _availability_start (1 = booked). Lets /rooms filter by
+# date range without touching the bookings table.
+LOOKAHEAD_DAYS = 365
+AVAILABILITY: dict[int, bytearray] = {}
+_availability_lock = threading.Lock()
+_availability_start = date.today()
+
+# SQL run by the request handlers. Keeping one copy of each statement means
+# every pooled connection's statement cache hits on the same text.
+SQL_USER_INSERT = 'INSERT INTO users (username, password, email, full_name, phone) VALUES (?, ?, ?, ?, ?)'
+SQL_USER_BY_NAME = 'SELECT * FROM users WHERE username = ?'
+SQL_USER_SET_PASSWORD = 'UPDATE users SET password = ? WHERE id = ?'
+SQL_ROOMS_LIST = 'SELECT * FROM rooms ORDER BY room_type, room_number'
+SQL_ROOM_BY_ID = 'SELECT * FROM rooms WHERE id = ?'
+SQL_ROOM_IDS = 'SELECT id FROM rooms'
+SQL_ROOM_DETAILS = 'SELECT id, room_number, room_type, price_per_night FROM rooms'
+# Booking queries name their columns so rows carry only what the pages show
+SQL_DASHBOARD_BOOKINGS = '''
+    SELECT id, room_id, check_in_date, check_out_date, total_price, status,
+           guest_count, special_requests
+    FROM bookings
+    WHERE user_id = ? AND status = 'confirmed'
+    ORDER BY check_in_date
+'''
+SQL_USER_BOOKINGS = '''
+    SELECT b.id, b.room_id, b.check_in_date, b.check_out_date, b.total_price, b.status,
+           b.guest_count, b.created_at, r.room_number, r.room_type, u.full_name
+    FROM bookings b
+    JOIN rooms r ON b.room_id = r.id
+    JOIN users u ON b.user_id = u.id
+    WHERE b.user_id = ?
+    ORDER BY b.created_at DESC
+'''
+# Filled in with one placeholder per user id by bookings_for_users
+SQL_BOOKINGS_FOR_USERS = '''
+    SELECT id, user_id, room_id, check_in_date, check_out_date, total_price, status, guest_count
+    FROM bookings
+    WHERE user_id IN ({})
+    ORDER BY user_id, check_in_date
+'''
+SQL_BOOKED_ROOM_IDS = '''
+    SELECT DISTINCT room_id FROM bookings
+    WHERE status = 'confirmed' AND check_in_date < ? AND check_out_date > ?
+'''
+SQL_BOOKED_RANGES = '''
+    SELECT room_id, check_in_date, check_out_date FROM bookings
+    WHERE status = 'confirmed' AND check_out_date > ? AND check_in_date < ?
+'''
+# The status check means two concurrent cancels can't both succeed
+SQL_CANCEL_BOOKING = '''
+    UPDATE bookings SET status = 'cancelled'
+    WHERE id = ? AND user_id = ? AND status = 'confirmed'
+    RETURNING room_id, check_in_date, check_out_date
+'''
+# The insert only happens if no confirmed booking for the room overlaps
+# [check_in, check_out), so availability is enforced in the same statement
+SQL_INSERT_BOOKING = '''
+    INSERT INTO bookings 
+    (user_id, room_id, check_in_date, check_out_date, total_price, guest_count, special_requests)
+    SELECT ?, ?, ?, ?, ?, ?, ?
+    WHERE NOT EXISTS (
+        SELECT 1 FROM bookings
+        WHERE room_id = ? AND status = 'confirmed'
+        AND check_in_date < ? AND check_out_date > ?
+    )
+'''
+
+# OWASP's minimum argon2id profile: ~19MB of memory, two passes
+_hasher = PasswordHasher(time_cost=2, memory_cost=19 * 1024, parallelism=1) if PasswordHasher else None
+
+def hash_password(password):
+    if _hasher is not None:
+        return _hasher.hash(password)
+    return generate_password_hash(password)
+
+def verify_password(stored_hash, password):
+    """Check a password against either an argon2 or a werkzeug hash"""
+    if not stored_hash.startswith('$argon2'):
+        return check_password_hash(stored_hash, password)
+    if _hasher is None:
+        return False
+    try:
+        return _hasher.verify(stored_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def password_needs_rehash(stored_hash):
+    if _hasher is None:
+        return False
+    return not stored_hash.startswith('$argon2') or _hasher.check_needs_rehash(stored_hash)
 
 def init_db():
-    conn = sqlite3.connect('hotel.db')
+    conn = sqlite3.connect(DATABASE)
     c = conn.cursor()
+    for pragma in CONNECTION_PRAGMAS:
+        c.execute(pragma)
     
     # Create users table
     c.execute('''CREATE TABLE IF NOT EXISTS users (
@@ -49,6 +197,14 @@ def init_db():
         FOREIGN KEY (room_id) REFERENCES rooms (id)
     )''')
     
+    # Indexes for the per-user booking lists, the room listing order, the
+    # overlap check on booking and the availability rebuild
+    c.execute('CREATE INDEX IF NOT EXISTS ix_bookings_user_status ON bookings(user_id, status, check_in_date)')
+    c.execute('CREATE INDEX IF NOT EXISTS ix_bookings_user_created ON bookings(user_id, created_at DESC)')
+    c.execute('CREATE INDEX IF NOT EXISTS ix_rooms_type_number ON rooms(room_type, room_number)')
+    c.execute('CREATE INDEX IF NOT EXISTS ix_bookings_room_status ON bookings(room_id, status, check_in_date)')
+    c.execute('CREATE INDEX IF NOT EXISTS ix_bookings_status_checkout ON bookings(status, check_out_date)')
+    
     # Insert some sample room types if they don't exist
     c.execute('SELECT COUNT(*) FROM rooms')
     if c.fetchone()[0] == 0:
@@ -64,31 +220,233 @@ def init_db():
                      sample_rooms)
     
     conn.commit()
+    
+    # Refresh planner statistics so the indexes above get used
+    c.execute('ANALYZE')
+    conn.commit()
+    
+    check_query_plans(conn)
+    load_rooms(conn)
+    build_availability(conn)
     conn.close()
+    
+    # Warm the pool so the first requests don't pay for connecting
+    while not _POOL.full():
+        _POOL.put_nowait(_connect())
+    start_writer()
 
-def get_db():
-    conn = sqlite3.connect('hotel.db')
+def _day_range(check_in, check_out):
+    """Clip [check_in, check_out) to the lookahead window as byte offsets"""
+    start = max((check_in - _availability_start).days, 0)
+    end = min((check_out - _availability_start).days, LOOKAHEAD_DAYS)
+    return start, end
+
+def _mark_days(room_id, check_in, check_out, value):
+    start, end = _day_range(date.fromisoformat(check_in), date.fromisoformat(check_out))
+    if start >= end:
+        return
+    with _availability_lock:
+        days = AVAILABILITY.setdefault(room_id, bytearray(LOOKAHEAD_DAYS))
+        days[start:end] = value * (end - start)
+
+def check_query_plans(conn):
+    """Log a warning for any request-path query that plans a full table scan"""
+    # SQL_ROOM_DETAILS is left out: it reads the whole (tiny) rooms table on purpose
+    queries = {
+        'SQL_USER_BY_NAME': SQL_USER_BY_NAME,
+        'SQL_USER_SET_PASSWORD': SQL_USER_SET_PASSWORD,
+        'SQL_ROOMS_LIST': SQL_ROOMS_LIST,
+        'SQL_ROOM_BY_ID': SQL_ROOM_BY_ID,
+        'SQL_ROOM_IDS': SQL_ROOM_IDS,
+        'SQL_DASHBOARD_BOOKINGS': SQL_DASHBOARD_BOOKINGS,
+        'SQL_USER_BOOKINGS': SQL_USER_BOOKINGS,
+        'SQL_BOOKINGS_FOR_USERS': SQL_BOOKINGS_FOR_USERS.format('?'),
+        'SQL_BOOKED_ROOM_IDS': SQL_BOOKED_ROOM_IDS,
+        'SQL_BOOKED_RANGES': SQL_BOOKED_RANGES,
+        'SQL_CANCEL_BOOKING': SQL_CANCEL_BOOKING,
+        'SQL_INSERT_BOOKING': SQL_INSERT_BOOKING,
+    }
+    for name, sql in queries.items():
+        params = [None] * sql.count('?')
+        for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, params):
+            detail = row[3]
+            if detail.startswith('SCAN') and 'INDEX' not in detail and 'CONSTANT ROW' not in detail:
+                app.logger.warning('%s plans a full table scan: %s', name, detail)
+
+def load_rooms(conn):
+    """Refill ROOMS_BY_ID from the rooms table"""
+    rooms = {room_id: {'room_number': number, 'room_type': room_type, 'price_per_night': price}
+             for room_id, number, room_type, price in conn.execute(SQL_ROOM_DETAILS)}
+    ROOMS_BY_ID.clear()
+    ROOMS_BY_ID.update(rooms)
+
+def with_room(bookings):
+    """Yield each booking as a dict with its room's details merged in"""
+    for booking in bookings:
+        room = ROOMS_BY_ID.get(booking['room_id'])
+        if room is None:
+            # Room added since the cache was filled
+            with get_db() as db:
+                load_rooms(db)
+            room = ROOMS_BY_ID[booking['room_id']]
+        row = dict(booking)
+        row.update(room)
+        yield row
+
+def bookings_for_users(db, user_ids, chunk=500):
+    """Fetch bookings for many users in a few IN queries, grouped by user id"""
+    user_ids = list(user_ids)
+    grouped = {user_id: [] for user_id in user_ids}
+    for i in range(0, len(user_ids), chunk):
+        batch = user_ids[i:i + chunk]
+        sql = SQL_BOOKINGS_FOR_USERS.format(','.join('?' * len(batch)))
+        for booking in db.execute(sql, batch):
+            grouped[booking['user_id']].append(booking)
+    return grouped
+
+def build_availability(conn):
+    """Rebuild AVAILABILITY from the confirmed bookings, starting today"""
+    global _availability_start
+    today = date.today()
+    window_end = date.fromordinal(today.toordinal() + LOOKAHEAD_DAYS).isoformat()
+    rooms = conn.execute(SQL_ROOM_IDS).fetchall()
+    booked = conn.execute(SQL_BOOKED_RANGES, [today.isoformat(), window_end]).fetchall()
+    
+    with _availability_lock:
+        _availability_start = today
+        AVAILABILITY.clear()
+        for (room_id,) in rooms:
+            AVAILABILITY[room_id] = bytearray(LOOKAHEAD_DAYS)
+    for room_id, check_in, check_out in booked:
+        _mark_days(room_id, check_in, check_out, b'\x01')
+
+def _connect():
+    conn = sqlite3.connect(DATABASE, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    conn.execute('PRAGMA foreign_keys=ON')
+    if app.debug:
+        # Log every statement while debugging
+        conn.set_trace_callback(app.logger.debug)
     return conn
 
+def _release(conn):
+    # Never hand a half-finished transaction to the next request
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _POOL.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+def _write_loop(conn):
+    while True:
+        sql, params, future = _WRITE_QUEUE.get()
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            with conn:
+                cursor = conn.execute(sql, params)
+                rows = cursor.fetchall()
+            future.set_result(WriteResult(cursor.rowcount, cursor.lastrowid, rows))
+        except BaseException as e:
+            future.set_exception(e)
+
+def start_writer():
+    """Start the writer thread and its connection, once per process"""
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_write_loop, args=(_connect(),),
+                                              name='hotel-db-writer', daemon=True)
+            _writer_thread.start()
+
+def execute_write(sql, params):
+    """Run one write statement on the writer thread, committed on return.
+    
+    Database errors are re-raised in the caller; RETURNING rows come back in
+    the result's rows.
+    """
+    if _writer_thread is None:
+        start_writer()
+    future = Future()
+    _WRITE_QUEUE.put((sql, params, future))
+    return future.result()
+
+@contextmanager
+def get_db():
+    """Borrow a pooled connection, shared by everything in the same request"""
+    db = g.get('_db')
+    if db is not None:
+        yield db
+        return
+    
+    try:
+        db = _POOL.get_nowait()
+    except queue.Empty:
+        db = _connect()
+    g._db = db
+    try:
+        yield db
+    finally:
+        _release(db)
+        # A streamed generator may be finalized after its request has ended
+        if has_app_context():
+            g.pop('_db', None)
+
+def stream_rows(sql, params, size=FETCH_SIZE):
+    """Yield rows a batch at a time, keeping the pooled connection until done"""
+    with get_db() as db:
+        cursor = db.execute(sql, params)
+        while rows := cursor.fetchmany(size):
+            yield from rows
+
+def lazy_rows(sql, params):
+    """Stream a query's rows, or return [] so templates can test for no rows"""
+    rows = stream_rows(sql, params)
+    first = next(rows, None)
+    if first is None:
+        return []
+    return chain([first], rows)
+
+def stream_page(template, **context):
+    # Pop flashes before the headers go out; once the body streams the
+    # session cookie can no longer be updated
+    get_flashed_messages()
+    return stream_template(template, **context)
+
+@app.before_request
+def load_user():
+    g.user_id = session.get('user_id')
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
+        if g.user_id is None:
             flash('Please login first.', 'error')
             return redirect(url_for('login'))
         return f(*args, **kwargs)
     return decorated_function
 
+# Display formats shared by the template filters
+DATE_DISPLAY_FORMAT = '%B %d, %Y'
+CURRENCY_FORMAT = ',.2f'
+
+@lru_cache(maxsize=4096)
+def _format_iso_date(value):
+    # Pages repeat the same few dates, so each one is only parsed once
+    return date.fromisoformat(value).strftime(DATE_DISPLAY_FORMAT)
+
 @app.template_filter('date')
 def date_filter(value):
     if isinstance(value, str):
-        return datetime.strptime(value, '%Y-%m-%d').strftime('%B %d, %Y')
-    return value.strftime('%B %d, %Y')
+        return _format_iso_date(value)
+    return value.strftime(DATE_DISPLAY_FORMAT)
 
 @app.template_filter('currency')
 def currency_filter(value):
-    return f"${value:,.2f}"
+    return '$' + format(value, CURRENCY_FORMAT)
 
 @app.route('/')
 def index():
@@ -103,17 +461,12 @@ def register():
         full_name = request.form['full_name']
         phone = request.form['phone']
         
-        db = get_db()
         try:
-            db.execute('INSERT INTO users (username, password, email, full_name, phone) VALUES (?, ?, ?, ?, ?)',
-                      [username, generate_password_hash(password), email, full_name, phone])
-            db.commit()
+            execute_write(SQL_USER_INSERT, [username, hash_password(password), email, full_name, phone])
             flash('Registration successful! Please login.', 'success')
             return redirect(url_for('login'))
         except sqlite3.IntegrityError:
             flash('Username or email already exists!', 'error')
-        finally:
-            db.close()
     
     return render_template('register.html')
 
@@ -123,11 +476,14 @@ def login():
         username = request.form['username']
         password = request.form['password']
         
-        db = get_db()
-        user = db.execute('SELECT * FROM users WHERE username = ?', [username]).fetchone()
-        db.close()
+        with get_db() as db:
+            user = db.execute(SQL_USER_BY_NAME, [username]).fetchone()
         
-        if user and check_password_hash(user['password'], password):
+        if user and verify_password(user['password'], password):
+            # Upgrade older werkzeug hashes or outdated argon2 parameters
+            if password_needs_rehash(user['password']):
+                execute_write(SQL_USER_SET_PASSWORD, [hash_password(password), user['id']])
+            
             session['user_id'] = user['id']
             session['username'] = user['username']
             flash('Welcome back!', 'success')
@@ -146,97 +502,114 @@ def logout():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    db = get_db()
     # Get user's active bookings
-    bookings = db.execute('''
-        SELECT b.*, r.room_number, r.room_type, r.price_per_night
-        FROM bookings b
-        JOIN rooms r ON b.room_id = r.id
-        WHERE b.user_id = ? AND b.status = 'confirmed'
-        ORDER BY b.check_in_date
-    ''', [session['user_id']]).fetchall()
-    db.close()
-    
-    return render_template('dashboard.html', bookings=bookings)
+    bookings = lazy_rows(SQL_DASHBOARD_BOOKINGS, [g.user_id])
+    if bookings:
+        bookings = with_room(bookings)
+    return stream_page('dashboard.html', bookings=bookings)
 
 @app.route('/rooms')
 def rooms():
-    db = get_db()
-    rooms = db.execute('SELECT * FROM rooms ORDER BY room_type, room_number').fetchall()
-    db.close()
+    with get_db() as db:
+        rooms = db.execute(SQL_ROOMS_LIST).fetchall()
+    
+    # Optional ?from=YYYY-MM-DD&to=YYYY-MM-DD keeps only rooms free for the whole stay
+    date_from = request.args.get('from')
+    date_to = request.args.get('to')
+    if date_from and date_to:
+        try:
+            stay_start = date.fromisoformat(date_from)
+            stay_end = date.fromisoformat(date_to)
+        except ValueError:
+            stay_start = stay_end = None
+        if not stay_start or stay_start >= stay_end:
+            flash('Invalid dates!', 'error')
+        elif (stay_end - date.today()).days > LOOKAHEAD_DAYS:
+            # Beyond the precomputed window, ask the bookings table
+            with get_db() as db:
+                booked = {row[0] for row in db.execute(SQL_BOOKED_ROOM_IDS,
+                                                       [stay_end.isoformat(), stay_start.isoformat()])}
+            rooms = [room for room in rooms if room['id'] not in booked]
+        else:
+            if date.today() != _availability_start:
+                with get_db() as db:
+                    build_availability(db)
+            start, end = _day_range(stay_start, stay_end)
+            with _availability_lock:
+                rooms = [room for room in rooms
+                         if room['id'] not in AVAILABILITY
+                         or AVAILABILITY[room['id']].count(1, start, end) == 0]
     return render_template('rooms.html', rooms=rooms)
 
 @app.route('/book/<int:room_id>', methods=['GET', 'POST'])
 @login_required
 def book_room(room_id):
-    db = get_db()
-    room = db.execute('SELECT * FROM rooms WHERE id = ?', [room_id]).fetchone()
+    with get_db() as db:
+        room = db.execute(SQL_ROOM_BY_ID, [room_id]).fetchone()
     
-    if request.method == 'POST':
-        check_in = request.form['check_in']
-        check_out = request.form['check_out']
-        guest_count = int(request.form['guest_count'])
-        special_requests = request.form['special_requests']
+        if request.method == 'POST':
+            check_in = request.form['check_in']
+            check_out = request.form['check_out']
+            guest_count = int(request.form['guest_count'])
+            special_requests = request.form['special_requests']
         
-        # Calculate total price
-        check_in_date = datetime.strptime(check_in, '%Y-%m-%d')
-        check_out_date = datetime.strptime(check_out, '%Y-%m-%d')
-        nights = (check_out_date - check_in_date).days
-        total_price = room['price_per_night'] * nights
+            # Calculate total price
+            try:
+                check_in_date = date.fromisoformat(check_in)
+                check_out_date = date.fromisoformat(check_out)
+            except ValueError:
+                flash('Invalid dates!', 'error')
+                return render_template('book.html', room=room)
+            nights = (check_out_date - check_in_date).days
+            if nights <= 0:
+                flash('Check-out date must be after check-in date!', 'error')
+                return render_template('book.html', room=room)
+            total_price = room['price_per_night'] * nights
+            
+            # Store YYYY-MM-DD so the overlap check compares correctly as text
+            check_in = check_in_date.isoformat()
+            check_out = check_out_date.isoformat()
         
-        try:
-            db.execute('''
-                INSERT INTO bookings 
-                (user_id, room_id, check_in_date, check_out_date, total_price, guest_count, special_requests)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', [session['user_id'], room_id, check_in, check_out, total_price, guest_count, special_requests])
-            db.execute('UPDATE rooms SET status = ? WHERE id = ?', ['occupied', room_id])
-            db.commit()
-            flash('Booking confirmed!', 'success')
-            return redirect(url_for('dashboard'))
-        except sqlite3.Error as e:
-            flash('Error making booking. Please try again.', 'error')
-        finally:
-            db.close()
+            try:
+                result = execute_write(SQL_INSERT_BOOKING, [g.user_id, room_id, check_in, check_out,
+                                                            total_price, guest_count, special_requests,
+                                                            room_id, check_out, check_in])
+                if result.rowcount == 0:
+                    flash('Room is already booked for those dates!', 'error')
+                    return render_template('book.html', room=room)
+                _mark_days(room_id, check_in, check_out, b'\x01')
+                flash('Booking confirmed!', 'success')
+                return redirect(url_for('dashboard'))
+            except sqlite3.Error as e:
+                flash('Error making booking. Please try again.', 'error')
     
     return render_template('book.html', room=room)
 
 @app.route('/bookings')
 @login_required
 def bookings():
-    db = get_db()
-    bookings = db.execute('''
-        SELECT b.*, r.room_number, r.room_type, u.full_name
-        FROM bookings b
-        JOIN rooms r ON b.room_id = r.id
-        JOIN users u ON b.user_id = u.id
-        WHERE b.user_id = ?
-        ORDER BY b.created_at DESC
-    ''', [session['user_id']]).fetchall()
-    db.close()
-    return render_template('bookings.html', bookings=bookings)
+    bookings = lazy_rows(SQL_USER_BOOKINGS, [g.user_id])
+    return stream_page('bookings.html', bookings=bookings)
 
 @app.route('/cancel_booking/<int:booking_id>')
 @login_required
 def cancel_booking(booking_id):
-    db = get_db()
     try:
-        # Get the room_id first
-        booking = db.execute('SELECT room_id FROM bookings WHERE id = ? AND user_id = ?', 
-                           [booking_id, session['user_id']]).fetchone()
-        if booking:
-            db.execute('UPDATE bookings SET status = ? WHERE id = ?', ['cancelled', booking_id])
-            db.execute('UPDATE rooms SET status = ? WHERE id = ?', ['available', booking['room_id']])
-            db.commit()
+        # Availability comes from the bookings themselves, so the room row
+        # is left alone
+        rows = execute_write(SQL_CANCEL_BOOKING, [booking_id, g.user_id]).rows
+        if rows:
+            booking = rows[0]
+            _mark_days(booking['room_id'], booking['check_in_date'], booking['check_out_date'], b'\x00')
             flash('Booking cancelled successfully!', 'success')
         else:
-            flash('Booking not found!', 'error')
+            flash('Booking not found or already cancelled!', 'error')
     except sqlite3.Error:
         flash('Error cancelling booking. Please try again.', 'error')
-    finally:
-        db.close()
     return redirect(url_for('bookings'))
 
 if __name__ == '__main__':
+    # Development server; set FLASK_DEBUG=1 for the debugger and reloader.
+    # Use wsgi.py with gunicorn in production.
     init_db()
-    app.run(debug=True)
+    app.run(threaded=True)
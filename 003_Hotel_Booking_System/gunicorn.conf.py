@@ -0,0 +1,15 @@
+# gunicorn.conf.py - Server settings used with `gunicorn -c gunicorn.conf.py wsgi:app`
+
+bind = '127.0.0.1:8000'
+
+# One process with a thread per pooled connection (POOL_SIZE in app.py).
+# Login hashing and SQLite release the GIL, so threads run concurrently,
+# and WAL mode lets readers proceed alongside the single writer. Keep a
+# single worker: the room availability map in app.py lives in process
+# memory and would drift between workers.
+worker_class = 'gthread'
+workers = 1
+threads = 8
+
+# Don't preload: connections opened before the fork must not be shared
+preload_app = False
@@ -0,0 +1,11 @@
+# wsgi.py - Production entry point for the Hotel Booking System
+#
+# Run with gunicorn's threaded workers (settings in gunicorn.conf.py):
+#
+#     pip install gunicorn
+#     gunicorn -c gunicorn.conf.py wsgi:app
+
+from app import app, init_db
+
+# Runs in each worker, so every process gets its own connection pool
+init_db()
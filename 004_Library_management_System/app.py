@@ -18,7 +18,12 @@ import sqlite3
 import json
 import csv
 import os
-from dataclasses import dataclass, asdict
+import threading
+import queue
+import uuid
+from itertools import islice
+from operator import attrgetter
+from dataclasses import dataclass, field, fields
 from typing import List, Optional, Dict, Any
 from enum import Enum
 from pathlib import Path
@@ -45,6 +50,13 @@ class MembershipType(Enum):
     FACULTY = "Faculty"
     SENIOR = "Senior"
 
+# Choices for the dialog dropdowns and their reverse lookups, built once
+BOOK_STATUS_VALUES = tuple(s.value for s in BookStatus)
+USER_STATUS_VALUES = tuple(s.value for s in UserStatus)
+MEMBERSHIP_TYPE_VALUES = tuple(m.value for m in MembershipType)
+BOOK_STATUS_BY_VALUE = {s.value: s for s in BookStatus}
+USER_STATUS_BY_VALUE = {s.value: s for s in UserStatus}
+
 @dataclass
 class Book:
     id: str
@@ -107,6 +119,141 @@ class Category:
     description: Optional[str] = None
     parent_id: Optional[str] = None
 
+# Applied once to the shared connection. WAL with synchronous=NORMAL skips
+# the fsync on every commit; library.db-wal and library.db-shm files sit
+# next to library.db while the app runs.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",  # 64MB page cache
+    "PRAGMA mmap_size = 268435456",  # read up to 256MB of the file through mmap
+    "PRAGMA foreign_keys = ON",
+)
+
+# Prepared statements kept per connection; room for every query in this module,
+# with the paged and per-table import variants, without evicting each other
+STATEMENT_CACHE_SIZE = 128
+
+# Inserts bind by name, so they don't depend on the table's column order
+SQL_INSERT_USER = '''INSERT INTO users
+    (id, name, email, phone, address, membership_type, membership_date, expiry_date,
+     status, borrowed_books, fine_amount, notes)
+    VALUES (:id, :name, :email, :phone, :address, :membership_type, :membership_date, :expiry_date,
+            :status, :borrowed_books, :fine_amount, :notes)'''
+SQL_INSERT_BORROW_RECORD = '''INSERT INTO borrow_records
+    (id, book_id, user_id, borrow_date, due_date, return_date, extended_date, late_fee, status, notes)
+    VALUES (:id, :book_id, :user_id, :borrow_date, :due_date, :return_date, :extended_date, :late_fee,
+            :status, :notes)'''
+# Probe of the UNIQUE index on books.isbn, so a duplicate add skips the insert
+SQL_ISBN_EXISTS = "SELECT 1 FROM books WHERE isbn = ? LIMIT 1"
+# Shared by add_borrow_record and return_book, so both reuse one cached statement
+SQL_SET_BOOK_STATUS = "UPDATE books SET status = ? WHERE id = ?"
+SQL_ADD_USER_BORROWED = "UPDATE users SET borrowed_books = borrowed_books + ? WHERE id = ?"
+
+# Full listings behind the three trees; _fill_tree pages them with LIMIT/OFFSET
+SQL_LIST_BOOKS = "SELECT id, title, author, isbn, status FROM books ORDER BY rowid"
+SQL_LIST_USERS = "SELECT id, name, email, phone, status FROM users ORDER BY rowid"
+SQL_LIST_ACTIVE_BORROWS = '''SELECT br.id, b.title, u.name, br.borrow_date, br.due_date, br.status
+    FROM borrow_records br
+    JOIN books b ON br.book_id = b.id
+    JOIN users u ON br.user_id = u.id
+    WHERE br.status = 'Active'
+    ORDER BY br.rowid'''
+
+# Searches go through the trigram full-text indexes, which match any substring
+# of three or more characters. Shorter terms use LIKE on the base table: a
+# prefix match on the NOCASE-indexed columns, then a substring match if that
+# finds nothing
+SQL_SEARCH_BOOKS = '''SELECT b.id, b.title, b.author, b.isbn, b.status
+    FROM books_fts f JOIN books b ON b.rowid = f.rowid
+    WHERE books_fts MATCH ? ORDER BY b.rowid'''
+SQL_PREFIX_BOOKS = '''SELECT id, title, author, isbn, status FROM books
+    WHERE title LIKE ?1 ESCAPE '\\' OR author LIKE ?1 ESCAPE '\\'
+    ORDER BY rowid'''
+SQL_SEARCH_BOOKS_SHORT = '''SELECT id, title, author, isbn, status FROM books
+    WHERE title LIKE ?1 ESCAPE '\\' OR author LIKE ?1 ESCAPE '\\'
+       OR isbn LIKE ?1 ESCAPE '\\' OR category LIKE ?1 ESCAPE '\\'
+    ORDER BY rowid'''
+SQL_SEARCH_USERS = '''SELECT u.id, u.name, u.email, u.phone, u.status
+    FROM users_fts f JOIN users u ON u.rowid = f.rowid
+    WHERE users_fts MATCH ? ORDER BY u.rowid'''
+SQL_PREFIX_USERS = '''SELECT id, name, email, phone, status FROM users
+    WHERE name LIKE ?1 ESCAPE '\\'
+    ORDER BY rowid'''
+SQL_SEARCH_USERS_SHORT = '''SELECT id, name, email, phone, status FROM users
+    WHERE name LIKE ?1 ESCAPE '\\' OR email LIKE ?1 ESCAPE '\\' OR phone LIKE ?1 ESCAPE '\\'
+    ORDER BY rowid'''
+FTS_MIN_TERM = 3
+# Single-pass escaping of search text: LIKE wildcards for the short-term query,
+# double quotes for the quoted FTS5 string
+LIKE_ESCAPES = str.maketrans({'%': r'\%', '_': r'\_', '\\': '\\\\'})
+FTS_ESCAPES = str.maketrans({'"': '""'})
+
+# Idle time after the last keystroke before a search runs
+SEARCH_DEBOUNCE_MS = 150
+
+# Rows fetched into a tree at a time; more are loaded as the user scrolls
+PAGE_SIZE = 200
+
+# Inserts a page of rows into a tree in one Tcl call. The rows go over as a
+# Tcl list object rather than script text, so their values need no quoting.
+TCL_INSERT_ROWS = '''{tree index rows} {
+    foreach row $rows {
+        $tree insert {} $index -id [lindex $row 0] -values $row
+        if {$index ne "end"} {incr index}
+    }
+}'''
+
+# Most rows a tree holds at once; pages scrolled far out of view are dropped
+# and fetched again if the user scrolls back
+MAX_TREE_ROWS = 5 * PAGE_SIZE
+
+# File buffer for CSV exports, so rows reach the disk in large writes
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Pages copied per step of an online backup, and how often (ms) the UI
+# checks the backup thread for progress
+BACKUP_PAGES_PER_STEP = 1024
+BACKUP_POLL_MS = 50
+
+# How often (ms) the UI checks for finished tree queries while any are pending
+QUERY_POLL_MS = 10
+
+# Rows handed to executemany at a time when importing CSV files
+IMPORT_CHUNK_SIZE = 10_000
+
+@dataclass
+class TreeWindow:
+    """The slice of a query's rows currently loaded into a tree"""
+    sql: str
+    params: tuple
+    start: int = 0  # offset of the first loaded row
+    end: int = 0  # offset just past the last loaded row
+    exhausted: bool = False
+    loading: bool = False  # a fill or sync is waiting on the query worker
+    rows: Dict[str, tuple] = field(default_factory=dict, repr=False)  # loaded rows by iid
+
+def fts_query(search_text: str) -> str:
+    """Build an FTS5 query for rows containing every word of search_text, in any order
+
+    Words too short for the trigram index stay in a phrase with the word
+    before them (or after, at the start), so they still narrow the match.
+    Each phrase is quoted, so operators in the text are literal.
+    """
+    phrases, leading = [], []
+    for word in search_text.split():
+        if len(word) >= FTS_MIN_TERM:
+            phrases.append(leading + [word])
+            leading = []
+        elif phrases:
+            phrases[-1].append(word)
+        else:
+            leading.append(word)
+    if not phrases:
+        phrases = [leading]
+    return ' '.join(f'"{" ".join(words).translate(FTS_ESCAPES)}"' for words in phrases)
+
 class DatabaseManager:
     def __init__(self, db_file=None):
         if db_file is None:
@@ -115,21 +262,40 @@ class DatabaseManager:
         else:
             self.db_file = db_file
         self._ensure_data_directory()
+        # One connection for the life of the app; the lock keeps each
+        # method's statements together if it is ever used off the UI thread
+        self.lock = threading.RLock()
+        self.conn = self.connect()
         self.setup_database()
 
+        # Book inserts reuse one SQL string and read the fields straight off
+        # the dataclass instead of going through asdict()
+        self._book_fields = tuple(f.name for f in fields(Book))
+        self._book_getter = attrgetter(*self._book_fields)
+        self._book_status_index = self._book_fields.index('status')
+        self._book_insert_sql = (f"INSERT INTO books ({', '.join(self._book_fields)}) "
+                                 f"VALUES ({', '.join('?' * len(self._book_fields))})")
+
+    def connect(self):
+        """Open a new connection with the app's PRAGMAs, e.g. for a worker thread"""
+        conn = sqlite3.connect(self.db_file, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def close(self):
+        """Close the shared connection"""
+        with self.lock:
+            self.conn.close()
+
     def _ensure_data_directory(self):
         """Ensure the data directory exists"""
-        data_dir = os.path.dirname(self.db_file)
-        if data_dir and not os.path.exists(data_dir):
-            os.makedirs(data_dir)
+        Path(self.db_file).parent.mkdir(parents=True, exist_ok=True)
 
     def setup_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_file)
-        c = conn.cursor()
-
-        # Enable foreign key support
-        c.execute("PRAGMA foreign_keys = ON")
+        c = self.conn.cursor()
 
         # Create Books table with additional fields
         c.execute('''CREATE TABLE IF NOT EXISTS books (
@@ -203,18 +369,71 @@ class DatabaseManager:
             FOREIGN KEY (parent_id) REFERENCES categories (id)
         )''')
 
-        conn.commit()
-        conn.close()
-
-    def backup_database(self, backup_path: str) -> bool:
-        """Create a backup of the database"""
+        # Indexes for searches, the borrow-record foreign keys and the active
+        # loans list (books.isbn and users.email are already indexed by UNIQUE)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_books_title ON books(title COLLATE NOCASE)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_books_author ON books(author COLLATE NOCASE)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_books_status ON books(status)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_users_name ON users(name COLLATE NOCASE)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_borrow_book ON borrow_records(book_id)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_borrow_user ON borrow_records(user_id)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_borrow_status ON borrow_records(status) WHERE status = 'Active'")
+
+        # Full-text indexes over the searchable columns, kept in step by triggers
+        self._create_fts(c, 'books', ('title', 'author', 'isbn', 'category'))
+        self._create_fts(c, 'users', ('name', 'email', 'phone'))
+
+        self.conn.commit()
+
+        # Refresh planner statistics so the indexes above get used
+        c.execute("ANALYZE")
+        self.conn.commit()
+
+    # The FTS tables are keyed on their content table's rowid. books and users
+    # have TEXT primary keys, so that rowid is implicit and VACUUM may renumber
+    # it, leaving every match joined to the wrong row. Anything that vacuums
+    # the database must follow it with
+    # INSERT INTO {table}_fts({table}_fts) VALUES ('rebuild') for both tables.
+    def _create_fts(self, c, table: str, columns: tuple):
+        """Create an external-content FTS5 table mirroring columns of table"""
+        fts = f"{table}_fts"
+        cols = ', '.join(columns)
+        new_cols = ', '.join(f"new.{col}" for col in columns)
+        old_cols = ', '.join(f"old.{col}" for col in columns)
+        exists = c.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts,)).fetchone()
+
+        c.execute(f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='{table}', content_rowid='rowid', tokenize='trigram')""")
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_cols});
+        END""")
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_cols});
+        END""")
+        c.execute(f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old_cols});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new_cols});
+        END""")
+        if not exists:
+            # Index the rows that were there before the FTS table
+            c.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    def backup_database(self, backup_path: str, progress=None) -> bool:
+        """Create a backup of the database; progress(status, remaining, total) is called per step"""
         try:
-            if os.path.exists(self.db_file):
-                import shutil
-                backup_file = f"{backup_path}/library_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-                shutil.copy2(self.db_file, backup_file)
-                return True
-            return False
+            backup_file = os.path.join(
+                backup_path, f"library_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db")
+            # The online backup API copies pages through a connection of its
+            # own, so the copy includes anything still sitting in the WAL file
+            # and can run off the UI thread without holding self.lock
+            source = sqlite3.connect(self.db_file)
+            target = sqlite3.connect(backup_file)
+            try:
+                source.backup(target, pages=BACKUP_PAGES_PER_STEP, progress=progress)
+            finally:
+                target.close()
+                source.close()
+            return True
         except Exception as e:
             print(f"Backup error: {e}")
             return False
@@ -222,95 +441,72 @@ class DatabaseManager:
     def add_book(self, book: Book) -> bool:
         """Add a new book to the database"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
-            
-            # Convert dataclass to dictionary and handle special types
-            book_dict = asdict(book)
-            book_dict['status'] = book.status.value
-            
-            # Prepare SQL statement dynamically
-            fields = ', '.join(book_dict.keys())
-            placeholders = ', '.join(['?' for _ in book_dict])
-            sql = f'INSERT INTO books ({fields}) VALUES ({placeholders})'
+            values = list(self._book_getter(book))
+            values[self._book_status_index] = book.status.value
             
-            c.execute(sql, list(book_dict.values()))
-            conn.commit()
+            with self.lock, self.conn:
+                if self.conn.execute(SQL_ISBN_EXISTS, (book.isbn,)).fetchone():
+                    print(f"Error adding book: ISBN {book.isbn} already exists")
+                    return False
+                self.conn.execute(self._book_insert_sql, values)
             return True
         except sqlite3.Error as e:
             print(f"Error adding book: {e}")
             return False
-        finally:
-            conn.close()
 
     def add_user(self, user: User) -> bool:
         """Add a new user to the database"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
-            c.execute('''INSERT INTO users VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-                     (user.id, user.name, user.email, user.phone, user.address,
-                      user.membership_date, user.status, user.borrowed_books))
-            conn.commit()
+            params = {**vars(user),
+                      'status': user.status.value,
+                      'membership_type': user.membership_type.value}
+            with self.lock, self.conn:
+                self.conn.execute(SQL_INSERT_USER, params)
             return True
         except sqlite3.Error as e:
             print(f"Error adding user: {e}")
             return False
-        finally:
-            conn.close()
 
     def add_borrow_record(self, record: BorrowRecord) -> bool:
         """Add a new borrowing record"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
-            c.execute('''INSERT INTO borrow_records VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-                     (record.id, record.book_id, record.user_id, record.borrow_date,
-                      record.due_date, record.return_date, record.late_fee, record.status))
-            # Update book status
-            c.execute('''UPDATE books SET status = ? WHERE id = ?''',
-                     (BookStatus.BORROWED.value, record.book_id))
-            # Update user's borrowed books count
-            c.execute('''UPDATE users SET borrowed_books = borrowed_books + 1 WHERE id = ?''',
-                     (record.user_id,))
-            conn.commit()
+            with self.lock, self.conn:
+                c = self.conn.cursor()
+                c.execute(SQL_INSERT_BORROW_RECORD, vars(record))
+                # Update book status
+                c.execute(SQL_SET_BOOK_STATUS, (BookStatus.BORROWED.value, record.book_id))
+                # Update user's borrowed books count
+                c.execute(SQL_ADD_USER_BORROWED, (1, record.user_id))
             return True
         except sqlite3.Error as e:
             print(f"Error adding borrow record: {e}")
             return False
-        finally:
-            conn.close()
 
     def return_book(self, record_id: str, return_date: str, late_fee: float = 0.0) -> bool:
         """Process a book return"""
         try:
-            conn = sqlite3.connect(self.db_file)
-            c = conn.cursor()
-            
-            # Get the record details first
-            c.execute('''SELECT book_id, user_id FROM borrow_records WHERE id = ?''', (record_id,))
-            book_id, user_id = c.fetchone()
-            
-            # Update the borrow record
-            c.execute('''UPDATE borrow_records 
-                        SET return_date = ?, late_fee = ?, status = 'Returned'
-                        WHERE id = ?''', (return_date, late_fee, record_id))
-            
-            # Update book status
-            c.execute('''UPDATE books SET status = ? WHERE id = ?''',
-                     (BookStatus.AVAILABLE.value, book_id))
-            
-            # Update user's borrowed books count
-            c.execute('''UPDATE users SET borrowed_books = borrowed_books - 1 WHERE id = ?''',
-                     (user_id,))
-            
-            conn.commit()
+            with self.lock, self.conn:
+                c = self.conn.cursor()
+                
+                # Close the record and get its book and user in the same statement
+                row = c.execute('''UPDATE borrow_records
+                                   SET return_date = ?, late_fee = ?, status = 'Returned'
+                                   WHERE id = ? AND status = 'Active'
+                                   RETURNING book_id, user_id''',
+                                (return_date, late_fee, record_id)).fetchone()
+                if row is None:
+                    return False
+                book_id, user_id = row
+                
+                # Update book status
+                c.execute(SQL_SET_BOOK_STATUS, (BookStatus.AVAILABLE.value, book_id))
+                
+                # Update user's borrowed books count
+                c.execute(SQL_ADD_USER_BORROWED, (-1, user_id))
             return True
         except sqlite3.Error as e:
             print(f"Error processing return: {e}")
             return False
-        finally:
-            conn.close()
 
 class BookDialog:
     def __init__(self, parent, book=None):
@@ -340,7 +536,7 @@ class BookDialog:
 
         # Status dropdown
         tk.Label(self.top, text="Status:").grid(row=len(fields), column=0, padx=5, pady=5)
-        self.status = ttk.Combobox(self.top, values=[s.value for s in BookStatus])
+        self.status = ttk.Combobox(self.top, values=BOOK_STATUS_VALUES)
         self.status.grid(row=len(fields), column=1, padx=5, pady=5)
 
         # Buttons
@@ -401,7 +597,7 @@ class UserDialog:
 
         # Status dropdown
         tk.Label(self.top, text="Status:").grid(row=len(fields), column=0, padx=5, pady=5)
-        self.status = ttk.Combobox(self.top, values=["Active", "Inactive"])
+        self.status = ttk.Combobox(self.top, values=USER_STATUS_VALUES)
         self.status.grid(row=len(fields), column=1, padx=5, pady=5)
         self.status.set("Active")
 
@@ -418,7 +614,7 @@ class UserDialog:
             self.email.insert(0, self.user.email)
             self.phone.insert(0, self.user.phone)
             self.address.insert(0, self.user.address)
-            self.status.set(self.user.status)
+            self.status.set(self.user.status.value)
 
     def save(self):
         self.result = {
@@ -456,9 +652,20 @@ class LibraryApp:
         self.user_search_var = tk.StringVar()
         self.book_search_var.trace('w', self.on_book_search_change)
         self.user_search_var.trace('w', self.on_user_search_change)
+        self._book_search_after_id = None
+        self._user_search_after_id = None
+        self._tree_pages = {}
+        # Views whose tree may be behind the database after a write;
+        # refresh_* skip the rest
+        self._dirty = {'books': True, 'users': True, 'circulation': True}
+        
+        self._start_query_worker()
+        self._about_dialog = None
         
         self.create_widgets()
         self.create_menus()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.refresh_all()
 
     def create_menus(self):
         menubar = tk.Menu(self.root)
@@ -472,7 +679,7 @@ class LibraryApp:
         file_menu.add_separator()
         file_menu.add_command(label="Settings", command=self.show_settings)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.on_close)
         menubar.add_cascade(label="File", menu=file_menu)
         
         # Books Menu
@@ -547,13 +754,22 @@ class LibraryApp:
         self.notebook.add(self.circ_frame, text='Circulation')
         self.setup_circulation_tab()
 
+        # Only the visible tab's tree is kept loaded; the others catch up
+        # when they are shown
+        self._tab_refresh = {
+            str(self.books_frame): self.refresh_books,
+            str(self.users_frame): self.refresh_users,
+            str(self.circ_frame): self.refresh_circulation,
+        }
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+
     def setup_books_tab(self):
         # Search frame
         search_frame = ttk.Frame(self.books_frame)
         search_frame.pack(fill='x', padx=5, pady=5)
         
         ttk.Label(search_frame, text="Search:").pack(side='left', padx=5)
-        self.book_search = ttk.Entry(search_frame)
+        self.book_search = ttk.Entry(search_frame, textvariable=self.book_search_var)
         self.book_search.pack(side='left', padx=5, fill='x', expand=True)
         
         # Books table
@@ -563,6 +779,8 @@ class LibraryApp:
         for col in columns:
             self.books_tree.heading(col, text=col)
             self.books_tree.column(col, width=100)
+        self.books_tree.configure(
+            yscrollcommand=lambda first, last: self._on_tree_scroll(self.books_tree, first, last))
         
         self.books_tree.pack(fill='both', expand=True, padx=5, pady=5)
 
@@ -572,7 +790,7 @@ class LibraryApp:
         search_frame.pack(fill='x', padx=5, pady=5)
         
         ttk.Label(search_frame, text="Search:").pack(side='left', padx=5)
-        self.user_search = ttk.Entry(search_frame)
+        self.user_search = ttk.Entry(search_frame, textvariable=self.user_search_var)
         self.user_search.pack(side='left', padx=5, fill='x', expand=True)
         
         # Users table
@@ -582,6 +800,8 @@ class LibraryApp:
         for col in columns:
             self.users_tree.heading(col, text=col)
             self.users_tree.column(col, width=100)
+        self.users_tree.configure(
+            yscrollcommand=lambda first, last: self._on_tree_scroll(self.users_tree, first, last))
         
         self.users_tree.pack(fill='both', expand=True, padx=5, pady=5)
 
@@ -596,6 +816,8 @@ class LibraryApp:
         for col in columns:
             self.borrow_tree.heading(col, text=col)
             self.borrow_tree.column(col, width=100)
+        self.borrow_tree.configure(
+            yscrollcommand=lambda first, last: self._on_tree_scroll(self.borrow_tree, first, last))
         
         self.borrow_tree.pack(fill='both', expand=True, padx=5, pady=5)
 
@@ -604,20 +826,22 @@ class LibraryApp:
         self.root.wait_window(dialog.top)
         if dialog.result:
             # Process the result and add to database
+            now = datetime.now().isoformat()
             book = Book(
-                id=str(datetime.now().timestamp()),
+                id=uuid.uuid4().hex,
                 title=dialog.result['title'],
                 author=dialog.result['author'],
                 isbn=dialog.result['isbn'],
                 category=dialog.result['category'],
-                status=BookStatus(dialog.result['status']),
+                status=BOOK_STATUS_BY_VALUE.get(dialog.result['status'], BookStatus.AVAILABLE),
                 location=dialog.result['location'],
-                added_date=datetime.now().isoformat(),
-                last_updated=datetime.now().isoformat()
+                added_date=now,
+                last_updated=now
             )
             if self.db.add_book(book):
                 messagebox.showinfo("Success", "Book added successfully!")
-                self.refresh_books()
+                self._mark_dirty('books')
+                self.refresh_all()
             else:
                 messagebox.showerror("Error", "Failed to add book")
 
@@ -627,17 +851,18 @@ class LibraryApp:
         if dialog.result:
             # Process the result and add to database
             user = User(
-                id=str(datetime.now().timestamp()),
+                id=uuid.uuid4().hex,
                 name=dialog.result['name'],
                 email=dialog.result['email'],
                 phone=dialog.result['phone'],
                 address=dialog.result['address'],
                 membership_date=datetime.now().isoformat(),
-                status=dialog.result['status']
+                status=USER_STATUS_BY_VALUE.get(dialog.result['status'], UserStatus.ACTIVE)
             )
             if self.db.add_user(user):
                 messagebox.showinfo("Success", "User added successfully!")
-                self.refresh_users()
+                self._mark_dirty('users')
+                self.refresh_all()
             else:
                 messagebox.showerror("Error", "Failed to add user")
 
@@ -657,71 +882,113 @@ class LibraryApp:
         """Backup the database file"""
         backup_dir = filedialog.askdirectory(title="Select Backup Location")
         if backup_dir:
-            if self.db.backup_database(backup_dir):
-                messagebox.showinfo("Success", "Database backup created successfully!")
-            else:
-                messagebox.showerror("Error", "Failed to create database backup")
+            dialog = tk.Toplevel(self.root)
+            dialog.title("Backup Database")
+            dialog.resizable(False, False)
+            dialog.transient(self.root)
+            ttk.Label(dialog, text="Backing up the database...").pack(padx=20, pady=(20, 5))
+            bar = ttk.Progressbar(dialog, length=300, mode='determinate')
+            bar.pack(padx=20, pady=(5, 20))
+            dialog.grab_set()
+
+            # The copy runs on a worker thread and reports through the queue,
+            # which the UI thread drains on a timer
+            updates = queue.Queue()
+            threading.Thread(target=self._run_backup, args=(backup_dir, updates), daemon=True).start()
+            self.root.after(BACKUP_POLL_MS, self._poll_backup, updates, dialog, bar)
+
+    def _run_backup(self, backup_dir, updates):
+        ok = self.db.backup_database(
+            backup_dir, progress=lambda status, remaining, total: updates.put((total - remaining, total)))
+        updates.put(ok)
+
+    def _poll_backup(self, updates, dialog, bar):
+        while True:
+            try:
+                update = updates.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(update, bool):
+                dialog.destroy()
+                if update:
+                    messagebox.showinfo("Success", "Database backup created successfully!")
+                else:
+                    messagebox.showerror("Error", "Failed to create database backup")
+                return
+            copied, total = update
+            bar.configure(maximum=total, value=copied)
+        self.root.after(BACKUP_POLL_MS, self._poll_backup, updates, dialog, bar)
 
     def export_data(self):
         """Export data to CSV files"""
         export_dir = filedialog.askdirectory(title="Select Export Location")
         if export_dir:
             try:
-                conn = sqlite3.connect(self.db.db_file)
-                cursor = conn.cursor()
+                cursor = self.db.conn.cursor()
                 
                 # Export tables
                 tables = ['books', 'users', 'borrow_records', 'reservations', 'categories']
                 for table in tables:
-                    cursor.execute(f"SELECT * FROM {table}")
-                    rows = cursor.fetchall()
-                    
-                    # Get column names
-                    cursor.execute(f"PRAGMA table_info({table})")
-                    columns = [col[1] for col in cursor.fetchall()]
-                    
-                    # Write to CSV
-                    with open(f"{export_dir}/{table}.csv", 'w', newline='') as f:
-                        writer = csv.writer(f)
-                        writer.writerow(columns)
-                        writer.writerows(rows)
+                    with self.db.lock:
+                        cursor.execute(f"SELECT * FROM {table}")
+                        columns = [col[0] for col in cursor.description]
+                        
+                        # Write to CSV straight from the cursor, a row at a time
+                        with open(f"{export_dir}/{table}.csv", 'w', newline='',
+                                  buffering=EXPORT_BUFFER_SIZE) as f:
+                            writer = csv.writer(f)
+                            writer.writerow(columns)
+                            writer.writerows(cursor)
                 
                 messagebox.showinfo("Success", "Data exported successfully!")
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to export data: {e}")
-            finally:
-                conn.close()
 
     def import_data(self):
         """Import data from CSV files"""
         import_dir = filedialog.askdirectory(title="Select Import Directory")
         if import_dir:
-            try:
-                conn = sqlite3.connect(self.db.db_file)
-                cursor = conn.cursor()
-                
-                # Import tables
-                tables = ['books', 'users', 'borrow_records', 'reservations', 'categories']
-                for table in tables:
-                    file_path = f"{import_dir}/{table}.csv"
-                    if os.path.exists(file_path):
-                        with open(file_path, 'r') as f:
-                            reader = csv.reader(f)
-                            columns = next(reader)  # Get column names
-                            
-                            # Prepare SQL statement
-                            placeholders = ','.join(['?' for _ in columns])
-                            sql = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
-                            
-                            # Insert data
-                            cursor.executemany(sql, reader)
-                
-                conn.commit()
-                messagebox.showinfo("Success", "Data imported successfully!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to import data: {e}")
-            finally:
-                conn.close()
+            conn = self.db.conn
+            with self.db.lock:
+                # Foreign keys can only be switched outside a transaction. With
+                # them off, tables load in any order; they're checked before commit.
+                conn.execute("PRAGMA foreign_keys = OFF")
+                conn.execute("PRAGMA synchronous = OFF")
+                try:
+                    cursor = conn.cursor()
+                    conn.execute("BEGIN")
+                    
+                    # Import tables
+                    tables = ['books', 'users', 'borrow_records', 'reservations', 'categories']
+                    for table in tables:
+                        file_path = f"{import_dir}/{table}.csv"
+                        if os.path.exists(file_path):
+                            with open(file_path, 'r', newline='') as f:
+                                reader = csv.reader(f)
+                                columns = next(reader)  # Get column names
+                                
+                                # Prepare SQL statement
+                                placeholders = ','.join(['?' for _ in columns])
+                                sql = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
+                                
+                                # Insert data in bounded chunks
+                                while chunk := list(islice(reader, IMPORT_CHUNK_SIZE)):
+                                    cursor.executemany(sql, chunk)
+                    
+                    violation = conn.execute("PRAGMA foreign_key_check").fetchone()
+                    if violation:
+                        raise sqlite3.IntegrityError(
+                            f"{violation[0]} row {violation[1]} references a missing {violation[2]} row")
+                    conn.commit()
+                    messagebox.showinfo("Success", "Data imported successfully!")
+                    self._mark_dirty('books', 'users', 'circulation')
+                    self.refresh_all()
+                except Exception as e:
+                    conn.rollback()
+                    messagebox.showerror("Error", f"Failed to import data: {e}")
+                finally:
+                    conn.execute("PRAGMA synchronous = NORMAL")
+                    conn.execute("PRAGMA foreign_keys = ON")
 
     def show_settings(self):
         """Show settings dialog"""
@@ -735,7 +1002,7 @@ class LibraryApp:
             messagebox.showwarning("Warning", "Please select a book to edit")
             return
         
-        book_id = self.books_tree.item(selected[0])['values'][0]
+        book_id = selected[0]
         # TODO: Get book details and show edit dialog
         pass
 
@@ -747,7 +1014,7 @@ class LibraryApp:
             return
         
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this book?"):
-            book_id = self.books_tree.item(selected[0])['values'][0]
+            book_id = selected[0]
             # TODO: Implement book deletion
             pass
 
@@ -773,7 +1040,7 @@ class LibraryApp:
             messagebox.showwarning("Warning", "Please select a user to edit")
             return
         
-        user_id = self.users_tree.item(selected[0])['values'][0]
+        user_id = selected[0]
         # TODO: Get user details and show edit dialog
         pass
 
@@ -785,7 +1052,7 @@ class LibraryApp:
             return
         
         if messagebox.askyesno("Confirm", "Are you sure you want to delete this user?"):
-            user_id = self.users_tree.item(selected[0])['values'][0]
+            user_id = selected[0]
             # TODO: Implement user deletion
             pass
 
@@ -834,87 +1101,295 @@ class LibraryApp:
         # TODO: Implement user guide
         pass
 
+    def on_close(self):
+        """Close the shared database connection and the window"""
+        self.db.close()
+        self.root.destroy()
+
     def show_about(self):
         """Show about dialog"""
+        # Built on first use, then hidden rather than destroyed on close
+        if self._about_dialog is None:
+            self._about_dialog = self._build_about()
+        self._about_dialog.deiconify()
+        self._about_dialog.lift()
+
+    def _build_about(self):
         about_dialog = tk.Toplevel(self.root)
         about_dialog.title("About Library Management System")
         about_dialog.geometry("400x300")
         about_dialog.resizable(False, False)
+        about_dialog.protocol("WM_DELETE_WINDOW", about_dialog.withdraw)
         
         ttk.Label(about_dialog, text="Library Management System", style="Title.TLabel").pack(pady=20)
         ttk.Label(about_dialog, text="Version 2.0").pack()
         ttk.Label(about_dialog, text="© 2025 Your Organization").pack(pady=10)
         ttk.Label(about_dialog, text="A comprehensive solution for\nmanaging library operations", justify="center").pack(pady=10)
         
-        ttk.Button(about_dialog, text="Close", command=about_dialog.destroy).pack(pady=20)
+        ttk.Button(about_dialog, text="Close", command=about_dialog.withdraw).pack(pady=20)
+        return about_dialog
 
     def on_book_search_change(self, *args):
-        """Handle book search input changes"""
-        search_text = self.book_search_var.get().lower()
-        for item in self.books_tree.get_children():
-            values = [str(v).lower() for v in self.books_tree.item(item)['values']]
-            if any(search_text in v for v in values):
-                self.books_tree.reattach(item, '', 'end')
-            else:
-                self.books_tree.detach(item)
+        """Handle book search input changes, once typing pauses"""
+        if self._book_search_after_id:
+            self.root.after_cancel(self._book_search_after_id)
+        self._book_search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self._do_book_search)
+
+    def _do_book_search(self):
+        self._book_search_after_id = None
+        self._show_books()
+
+    def _show_books(self):
+        """Load the books tree with the current search's matches, or every book if there is none"""
+        search_text = self.book_search_var.get().strip()
+        if not search_text:
+            self._sync_tree(self.books_tree, SQL_LIST_BOOKS)
+        else:
+            self._run_search(self.books_tree, search_text,
+                             SQL_SEARCH_BOOKS, SQL_PREFIX_BOOKS, SQL_SEARCH_BOOKS_SHORT)
+        self._dirty['books'] = False
 
     def on_user_search_change(self, *args):
-        """Handle user search input changes"""
-        search_text = self.user_search_var.get().lower()
-        for item in self.users_tree.get_children():
-            values = [str(v).lower() for v in self.users_tree.item(item)['values']]
-            if any(search_text in v for v in values):
-                self.users_tree.reattach(item, '', 'end')
-            else:
-                self.users_tree.detach(item)
+        """Handle user search input changes, once typing pauses"""
+        if self._user_search_after_id:
+            self.root.after_cancel(self._user_search_after_id)
+        self._user_search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self._do_user_search)
+
+    def _do_user_search(self):
+        self._user_search_after_id = None
+        self._show_users()
+
+    def _show_users(self):
+        """Load the users tree with the current search's matches, or every user if there is none"""
+        search_text = self.user_search_var.get().strip()
+        if not search_text:
+            self._sync_tree(self.users_tree, SQL_LIST_USERS)
+        else:
+            self._run_search(self.users_tree, search_text,
+                             SQL_SEARCH_USERS, SQL_PREFIX_USERS, SQL_SEARCH_USERS_SHORT)
+        self._dirty['users'] = False
+
+    def _run_search(self, tree, search_text, fts_sql, prefix_sql, short_sql):
+        """Fill tree with the rows matching search_text"""
+        if len(search_text) >= FTS_MIN_TERM:
+            self._fill_tree(tree, fts_sql, (fts_query(search_text),))
+            return
+        # Short terms try the indexed prefix match first and only scan for
+        # the term anywhere in the row when nothing starts with it
+        escaped = search_text.translate(LIKE_ESCAPES)
+
+        def fall_back(rows):
+            if not rows:
+                self._fill_tree(tree, short_sql, (f"%{escaped}%",))
+
+        self._fill_tree(tree, prefix_sql, (f"{escaped}%",), on_loaded=fall_back)
+
+    def _start_query_worker(self):
+        """Start the thread that runs tree queries off the UI thread"""
+        self._query_requests = queue.Queue()
+        self._query_results = queue.Queue()
+        self._queries_pending = 0
+        # Callbacks of queued queries, by (sql, params), that identical
+        # requests can share instead of running the query again
+        self._shared_queries = {}
+        threading.Thread(target=self._query_loop, daemon=True).start()
+
+    def _query_loop(self):
+        # A connection of its own, so with WAL these reads don't wait on the
+        # UI thread's connection or its lock
+        conn = self.db.connect()
+        while True:
+            key, callbacks = self._query_requests.get()
+            sql, params = key
+            try:
+                rows = conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                print(f"Query error: {e}")
+                rows = []
+            self._query_results.put((key, callbacks, rows))
+
+    def _query_async(self, sql, params, callback):
+        """Run sql on the worker thread, then call callback(rows) on the UI thread"""
+        key = (sql, tuple(params))
+        callbacks = self._shared_queries.get(key)
+        if callbacks is not None:
+            callbacks.append(callback)
+            return
+        callbacks = self._shared_queries[key] = [callback]
+        self._query_requests.put((key, callbacks))
+        if not self._queries_pending:
+            self.root.after(QUERY_POLL_MS, self._poll_queries)
+        self._queries_pending += 1
+
+    def _poll_queries(self):
+        while True:
+            try:
+                key, callbacks, rows = self._query_results.get_nowait()
+            except queue.Empty:
+                break
+            self._queries_pending -= 1
+            if self._shared_queries.get(key) is callbacks:
+                del self._shared_queries[key]
+            for callback in callbacks:
+                callback(rows)
+        if self._queries_pending:
+            self.root.after(QUERY_POLL_MS, self._poll_queries)
+
+    def _fill_tree(self, tree, sql, params=(), on_loaded=None):
+        """Replace a tree's rows with the first page of sql; the rest load on scroll
+
+        sql must select the record id first; it becomes the row's iid, so a
+        selection maps straight back to its record without reading the row.
+        The query runs on the worker thread; on_loaded(rows) is called once
+        the first page is in the tree.
+        """
+        window = TreeWindow(sql, params, loading=True)
+        self._tree_pages[tree] = window
+
+        def apply(rows):
+            # A newer fill or sync has replaced this one
+            if self._tree_pages.get(tree) is not window:
+                return
+            tree.delete(*tree.get_children())
+            self._insert_rows(tree, 'end', rows)
+            # Tk hands iids back as strings, so key rows the same way
+            window.rows = {str(row[0]): row for row in rows}
+            window.end = len(rows)
+            window.exhausted = len(rows) < PAGE_SIZE
+            window.loading = False
+            if on_loaded:
+                on_loaded(rows)
+
+        self._query_async(f"{sql} LIMIT ? OFFSET ?", (*params, PAGE_SIZE, 0), apply)
+
+    def _sync_tree(self, tree, sql):
+        """Bring tree's loaded rows up to date with sql, touching only rows that changed
+
+        Falls back to _fill_tree when the tree is showing a different query,
+        such as search results.
+        """
+        window = self._tree_pages.get(tree)
+        if window is None or window.sql != sql or window.params or window.loading:
+            self._fill_tree(tree, sql)
+            return
+        limit = max(window.end - window.start, PAGE_SIZE)
+        window.loading = True
+
+        def apply(rows):
+            if self._tree_pages.get(tree) is not window:
+                return
+            new = {str(row[0]): row for row in rows}
+            gone = [iid for iid in window.rows if iid not in new]
+            if gone:
+                tree.delete(*gone)
+            # Rows keep their relative order, so walking the new rows in order
+            # and inserting the missing ones at their index rebuilds the sequence
+            for index, row in enumerate(rows):
+                old = window.rows.get(str(row[0]))
+                if old is None:
+                    tree.insert('', index, iid=row[0], values=row)
+                elif old != row:
+                    tree.item(row[0], values=row)
+
+            window.rows = new
+            window.end = window.start + len(rows)
+            window.exhausted = len(rows) < limit
+            window.loading = False
+
+        self._query_async(f"{sql} LIMIT ? OFFSET ?", (*window.params, limit, window.start), apply)
+
+    def _fetch_rows(self, window, offset, limit):
+        with self.db.lock:
+            return self.db.conn.execute(f"{window.sql} LIMIT ? OFFSET ?",
+                                        (*window.params, limit, offset)).fetchall()
+
+    def _insert_rows(self, tree, index, rows):
+        """Insert rows at index in a single Tcl call; each row's first value is its iid"""
+        if rows:
+            tree.tk.call('apply', TCL_INSERT_ROWS, tree, index, rows)
+
+    def _load_next_page(self, tree):
+        """Append the next PAGE_SIZE rows to tree; returns False once all are loaded"""
+        window = self._tree_pages.get(tree)
+        if window is None or window.loading or window.exhausted:
+            return False
+        rows = self._fetch_rows(window, window.end, PAGE_SIZE)
+        self._insert_rows(tree, 'end', rows)
+        window.rows.update((str(row[0]), row) for row in rows)
+        window.end += len(rows)
+        window.exhausted = len(rows) < PAGE_SIZE
+
+        # Drop rows off the top, shifting the view so what's shown stays put
+        excess = window.end - window.start - MAX_TREE_ROWS
+        if excess > 0:
+            dropped = tree.get_children()[:excess]
+            tree.delete(*dropped)
+            for iid in dropped:
+                del window.rows[iid]
+            tree.yview_scroll(-excess, 'units')
+            window.start += excess
+        return bool(rows)
+
+    def _load_prev_page(self, tree):
+        """Put back the PAGE_SIZE rows above the top of tree; returns False at the first row"""
+        window = self._tree_pages.get(tree)
+        if window is None or window.loading or window.start == 0:
+            return False
+        start = max(window.start - PAGE_SIZE, 0)
+        rows = self._fetch_rows(window, start, window.start - start)
+        self._insert_rows(tree, 0, rows)
+        window.rows.update((str(row[0]), row) for row in rows)
+        tree.yview_scroll(len(rows), 'units')
+        window.start = start
+
+        excess = window.end - window.start - MAX_TREE_ROWS
+        if excess > 0:
+            dropped = tree.get_children()[-excess:]
+            tree.delete(*dropped)
+            for iid in dropped:
+                del window.rows[iid]
+            window.end -= excess
+            window.exhausted = False
+        return True
+
+    def _on_tree_scroll(self, tree, first, last):
+        # Fetch more rows as the view nears either end of what's loaded
+        if float(last) >= 0.9:
+            self._load_next_page(tree)
+        elif float(first) <= 0.1:
+            self._load_prev_page(tree)
+
+    def _mark_dirty(self, *views):
+        for view in views:
+            self._dirty[view] = True
+        # Queries already queued may have read the old rows; later requests
+        # must run their own
+        self._shared_queries.clear()
 
     def refresh_books(self):
-        """Refresh the books treeview"""
-        for item in self.books_tree.get_children():
-            self.books_tree.delete(item)
-            
-        conn = sqlite3.connect(self.db.db_file)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, title, author, isbn, status FROM books")
-        for row in cursor.fetchall():
-            self.books_tree.insert('', 'end', values=row)
-        conn.close()
+        """Refresh the books treeview, if it is out of date"""
+        if self._dirty['books']:
+            self._show_books()
 
     def refresh_users(self):
-        """Refresh the users treeview"""
-        for item in self.users_tree.get_children():
-            self.users_tree.delete(item)
-            
-        conn = sqlite3.connect(self.db.db_file)
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, name, email, phone, status FROM users")
-        for row in cursor.fetchall():
-            self.users_tree.insert('', 'end', values=row)
-        conn.close()
+        """Refresh the users treeview, if it is out of date"""
+        if self._dirty['users']:
+            self._show_users()
 
     def refresh_all(self):
-        """Refresh all data views"""
-        self.refresh_books()
-        self.refresh_users()
-        self.refresh_circulation()
+        """Refresh the visible data view; the others refresh when their tab is shown"""
+        self.on_tab_changed()
+
+    def on_tab_changed(self, event=None):
+        refresh = self._tab_refresh.get(self.notebook.select())
+        if refresh:
+            refresh()
 
     def refresh_circulation(self):
-        """Refresh the circulation treeview"""
-        for item in self.borrow_tree.get_children():
-            self.borrow_tree.delete(item)
-            
-        conn = sqlite3.connect(self.db.db_file)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT br.id, b.title, u.name, br.borrow_date, br.due_date, br.status
-            FROM borrow_records br
-            JOIN books b ON br.book_id = b.id
-            JOIN users u ON br.user_id = u.id
-            WHERE br.status = 'Active'
-        """)
-        for row in cursor.fetchall():
-            self.borrow_tree.insert('', 'end', values=row)
-        conn.close()
+        """Refresh the circulation treeview, if it is out of date"""
+        if self._dirty['circulation']:
+            self._sync_tree(self.borrow_tree, SQL_LIST_ACTIVE_BORROWS)
+            self._dirty['circulation'] = False
 
 def main():
     root = tk.Tk()